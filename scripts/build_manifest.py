@@ -13,7 +13,7 @@ Responsibilities
      • Orientation, dimensions, primary color palette
      • AI generated tags (3 – 5) and description via OpenAI Vision (if configured)
      • Numeric difficulty score (1 – 5)
-     • Camera / lens metadata when available via EXIF
+     • Camera / lens metadata from Drive's image metadata or EXIF
 4. Persist the static manifest to public/manifest.json so the frontend can load
    instantly without performing heavy client-side work.
 
@@ -24,35 +24,62 @@ GOOGLE_DRIVE_FOLDER_ID   Root folder id that contains the portfolio images.
 OPENAI_API_KEY           (Optional) Enables GPT-based tagging for best accuracy.
 
 Optional knobs:
-DRIVE_PAGE_SIZE          Override pagination size (default 200).
-SKIP_AI                  When set to "1", skips AI/image analysis (useful for
-                         quick smoke tests).
+DRIVE_PAGE_SIZE          Override pagination size (default 1000, Drive's maximum).
+DRIVE_LIST_WORKERS       Sibling folders listed concurrently (default 4). Raise
+                         it for wide folder trees; 429s are retried with backoff.
+SKIP_AI                  When set to "1", skips AI/image analysis and image
+                         downloads; entries use Drive metadata only and are
+                         marked pending, so the next full run analyses them
+                         (useful for quick smoke tests).
+MAX_WORKERS              Images analysed concurrently (default 8). Downloads and
+                         OpenAI calls are I/O bound, so threads overlap them.
+CHECKPOINT_EVERY         Save the manifest after this many freshly analysed
+                         images (default 25, 0 disables) so interrupted runs
+                         resume where they stopped.
+FALLBACK_BATCH_SIZE      Images per MobileNetV2 predict() call when OpenAI tags
+                         are unavailable (default 32).
+FORCE_REBUILD            When set to "1", rewrites the manifest even if Drive is
+                         unchanged since the last run.
+MANIFEST_PRETTY          When set to "1", writes an indented manifest instead of
+                         compact JSON (handy for reviewing diffs).
+MANIFEST_COMPRESS        When set to "1", also writes manifest.json.gz (and .br
+                         if the brotli package is installed) for hosts that
+                         serve pre-compressed files.
+MANIFEST_NDJSON          When set to "1", also writes manifest.ndjson with one
+                         entry per line for streaming clients.
 
 The script is idempotent and safe to run repeatedly. It keeps a cache by reusing
-existing manifest data whenever the Drive `modifiedTime` is unchanged and our
-internal AI version stamp matches.
+existing manifest data whenever the Drive `modifiedTime` (or, failing that, the
+file's `md5Checksum`) is unchanged and our internal AI version stamp matches.
+Renamed or moved files keep their analysis with refreshed Drive fields, and
+copies reuse the analysis of any entry with the same `md5Checksum`.
 """
 
 from __future__ import annotations
 
+import functools
+import gzip
 import io
 import json
 import logging
-import math
 import os
 import sys
+import threading
 import time
 import re
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
 from pathlib import Path
 from textwrap import dedent
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import requests
-from PIL import Image, ImageStat, UnidentifiedImageError
-from PIL.ExifTags import TAGS as EXIF_TAGS
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image
+from PIL.ExifTags import IFD as EXIF_IFD, TAGS as EXIF_TAGS
 
 # Optional OpenAI client for high-accuracy tagging
 try:
@@ -60,55 +87,117 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     OpenAI = None  # type: ignore
 
-# Lazy imports for TensorFlow so we only pay the cost when needed.
+# Optional orjson for fast (de)serialisation; stdlib json is the fallback.
 try:
-    import tensorflow as tf
-    from tensorflow.keras.applications.mobilenet_v2 import (
-        MobileNetV2,
-        decode_predictions,
-        preprocess_input,
-    )
-except Exception:  # pragma: no cover - fallback if TF is not available
-    tf = None  # type: ignore
-    MobileNetV2 = None  # type: ignore
-    decode_predictions = None  # type: ignore
-    preprocess_input = None  # type: ignore
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+# Optional Brotli encoder for pre-compressed manifest copies.
+try:
+    import brotli
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore
+
+# TensorFlow is imported inside load_tf_model: the import alone takes seconds
+# and hundreds of MB, and most runs only reuse cached entries.
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2
 
 
 # ==== CONSTANTS =============================================================
 
 AI_VERSION = "2025-03-20"  # bump to force reprocessing of all assets
-SUPPORTED_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp", "bmp"}
+PENDING_AI_VERSION = "PENDING"  # entries without a real analysis; never matches AI_VERSION
+SUPPORTED_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif", "webp", "bmp"})
+IMAGE_NAME_SUFFIXES = tuple(sorted("." + ext for ext in SUPPORTED_EXTENSIONS))
+IMAGE_SUFFIX_MAX_LEN = max(len(suffix) for suffix in IMAGE_NAME_SUFFIXES)
 IMAGE_MIME_PREFIXES = ("image/",)
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+# Formats that realistically carry EXIF; others skip the tag walk entirely.
+EXIF_EXTENSIONS = frozenset({"jpg", "jpeg", "tif", "tiff"})
+EXIF_MIME_TYPES = frozenset({"image/jpeg", "image/tiff"})
 DRIVE_API_URL = "https://www.googleapis.com/drive/v3/files"
+DRIVE_LIST_PARAMS = {
+    "fields": (
+        "nextPageToken,"
+        "files(id,name,mimeType,createdTime,modifiedTime,webViewLink,md5Checksum,"
+        "imageMediaMetadata(width,height,rotation,time,cameraModel,lens))"
+    ),
+    "orderBy": "name",
+    "supportsAllDrives": "true",
+    "includeItemsFromAllDrives": "true",
+}
+DRIVE_LIST_WORKERS = max(1, int(os.getenv("DRIVE_LIST_WORKERS", "4")))  # concurrent folder listings; keeps us under Drive's per-user QPS
 OUTPUT_PATH = Path("public/manifest.json")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_REQUEST_INTERVAL = float(os.getenv("OPENAI_REQUEST_INTERVAL", "0"))  # seconds between calls
 OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
 OPENAI_BACKOFF_SECONDS = float(os.getenv("OPENAI_BACKOFF_SECONDS", "20"))
+# Pacing state shared by every worker thread, guarded by _openai_lock. A rate
+# limit seen by one worker pauses all of them until the deadline passes.
 _last_openai_call = 0.0
+_openai_paused_until = 0.0
+_openai_lock = threading.Lock()
+MAX_WORKERS = max(1, int(os.getenv("MAX_WORKERS", "8")))  # concurrent per-image analyses
+CHECKPOINT_EVERY = int(os.getenv("CHECKPOINT_EVERY", "25"))  # analysed images between manifest saves
+FALLBACK_BATCH_SIZE = max(1, int(os.getenv("FALLBACK_BATCH_SIZE", "32")))  # images per MobileNetV2 predict() call
+
+TAG_SEPARATOR_RE = re.compile(r"[\s_/,-]+")
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+RETRY_AFTER_RE = re.compile(r"try again in ([0-9.]+)s")
+
+# Shared by every placeholder entry; a tuple so it can't be mutated in place.
+EMPTY_TAGS: Tuple[str, ...] = ()
+# Field values used when an image has not been (or could not be) analysed.
+DEFAULT_DIFFICULTY = 3
+DEFAULT_COLOR = "Neutral"
+DEFAULT_ORIENTATION = "Landscape"
+UNKNOWN_EQUIPMENT = "Unknown"
 
 # Slightly smaller thumbnail than the on-site display to minimise download.
 IMAGE_DOWNLOAD_SIZE = "w512"
+IMAGE_DISPLAY_SIZE = "w1200"
+MODEL_INPUT_SIZE = (224, 224)  # MobileNetV2 input; the largest size analysis needs
+IMAGE_CDN_PREFIX = "https://lh3.googleusercontent.com/d/"
+_DOWNLOAD_SUFFIX = "=" + IMAGE_DOWNLOAD_SIZE
+_DISPLAY_SUFFIX = "=" + IMAGE_DISPLAY_SIZE
 
 COLOR_PALETTE = {
-    "Red": np.array([214, 69, 69]),
-    "Orange": np.array([242, 153, 74]),
-    "Yellow": np.array([242, 201, 76]),
-    "Green": np.array([39, 174, 96]),
-    "Blue": np.array([47, 128, 237]),
-    "Purple": np.array([155, 81, 224]),
-    "Brown": np.array([141, 110, 99]),
-    "Black": np.array([33, 33, 33]),
-    "White": np.array([245, 245, 245]),
-    "Gray": np.array([189, 189, 189]),
-    "Neutral": np.array([149, 165, 166]),
+    "Red": np.array([214, 69, 69], dtype=np.float32),
+    "Orange": np.array([242, 153, 74], dtype=np.float32),
+    "Yellow": np.array([242, 201, 76], dtype=np.float32),
+    "Green": np.array([39, 174, 96], dtype=np.float32),
+    "Blue": np.array([47, 128, 237], dtype=np.float32),
+    "Purple": np.array([155, 81, 224], dtype=np.float32),
+    "Brown": np.array([141, 110, 99], dtype=np.float32),
+    "Black": np.array([33, 33, 33], dtype=np.float32),
+    "White": np.array([245, 245, 245], dtype=np.float32),
+    "Gray": np.array([189, 189, 189], dtype=np.float32),
+    "Neutral": np.array([149, 165, 166], dtype=np.float32),
 }
+PALETTE_NAMES = tuple(COLOR_PALETTE)
+PALETTE_ARRAY = np.stack(list(COLOR_PALETTE.values()))
+
+
+# Fallback date for undated assets. Fixed for the run so every such asset lands
+# in the same season and derive_season_and_year's cache sees a single key.
+RUN_STARTED_AT = datetime.utcnow()
+
+# Indexed by month number (1-12); slot 0 is unused.
+MONTH_TO_SEASON = (
+    "",
+    "Winter", "Winter",
+    "Spring", "Spring", "Spring",
+    "Summer", "Summer", "Summer",
+    "Fall", "Fall", "Fall",
+    "Winter",
+)
 
 
 # ==== DATA MODELS ===========================================================
 
-@dataclass
+@dataclass(slots=True)
 class DriveItem:
     id: str
     name: str
@@ -116,28 +205,48 @@ class DriveItem:
     createdTime: str
     modifiedTime: str
     webViewLink: str
-    parents: List[str]
-    size: Optional[str]
     path: str
+    md5Checksum: str = ""
+    imageMediaMetadata: Optional[dict] = None
 
     @property
     def is_folder(self) -> bool:
-        return self.mimeType == "application/vnd.google-apps.folder"
+        return self.mimeType == FOLDER_MIME_TYPE
 
     @property
     def extension(self) -> str:
-        return self.name.split(".")[-1].lower()
+        return self.name.rpartition(".")[2].lower()
 
     @property
     def display_name(self) -> str:
-        return ".".join(self.name.split(".")[:-1]) or self.name
+        return self.name.rpartition(".")[0] or self.name
+
+    @property
+    def may_have_exif(self) -> bool:
+        return self.mimeType.lower() in EXIF_MIME_TYPES or self.extension in EXIF_EXTENSIONS
+
+    @property
+    def media_dimensions(self) -> Optional[Tuple[int, int]]:
+        """Displayed (width, height) from Drive's image metadata, if reported."""
+        media = self.imageMediaMetadata or {}
+        width, height = media.get("width"), media.get("height")
+        if not width or not height:
+            return None
+        # Drive reports stored pixels; odd quarter-turn rotations swap the axes.
+        if media.get("rotation", 0) % 2:
+            width, height = height, width
+        return int(width), int(height)
 
     @property
     def image_url(self) -> str:
-        return f"https://lh3.googleusercontent.com/d/{self.id}={IMAGE_DOWNLOAD_SIZE}"
+        return IMAGE_CDN_PREFIX + self.id + _DOWNLOAD_SUFFIX
+
+    @property
+    def display_url(self) -> str:
+        return IMAGE_CDN_PREFIX + self.id + _DISPLAY_SUFFIX
 
 
-@dataclass
+@dataclass(slots=True)
 class ManifestEntry:
     id: str
     name: str
@@ -149,7 +258,7 @@ class ManifestEntry:
     mimeType: str
     season: str
     year: int
-    tags: List[str]
+    tags: Sequence[str]
     difficulty: int
     color: str
     orientation: str
@@ -160,6 +269,24 @@ class ManifestEntry:
     dateTime: Optional[str]
     description: str = ""
     aiVersion: str = AI_VERSION
+    md5Checksum: str = ""
+
+
+@dataclass(slots=True)
+class ImageAnalysis:
+    """Per-image results gathered by a worker, before any batched fallback tagging."""
+
+    item: DriveItem
+    tags: List[str]
+    difficulty: int
+    color: str
+    description: str
+    width: int
+    height: int
+    camera: str
+    lens: str
+    dateTime: Optional[str]
+    model_input: Optional[np.ndarray] = None  # set while waiting for MobileNetV2
 
 
 # ==== LOGGING ===============================================================
@@ -172,69 +299,167 @@ logging.basicConfig(
 logger = logging.getLogger("manifest")
 
 
+# ==== JSON HELPERS ==========================================================
+
+def json_loads(raw: bytes):
+    """Decode UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_default(obj):
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj, pretty: bool = False) -> bytes:
+    """
+    Encode to UTF-8 JSON bytes, using orjson when installed.
+
+    Output is compact unless `pretty` is set. Dataclasses are serialised
+    directly (orjson handles them natively), so callers don't need an
+    intermediate asdict() copy.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+# ==== HTTP SESSION ==========================================================
+
+def create_session() -> requests.Session:
+    """
+    Shared session so TCP/TLS connections are reused across Drive pages and
+    image downloads. Transient 429/5xx responses are retried with exponential
+    backoff; the final response is still returned so callers keep their own
+    error handling.
+    """
+    session = requests.Session()
+    # requests already sends "Accept-Encoding: gzip", but Google APIs only
+    # compress responses for clients whose User-Agent also contains "gzip".
+    session.headers["User-Agent"] = f"{session.headers['User-Agent']} portfolio-manifest (gzip)"
+    retry = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    # One pool per host (Drive API, googleusercontent); each sized so every
+    # worker thread can hold a keep-alive connection.
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=max(MAX_WORKERS, DRIVE_LIST_WORKERS),
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+SESSION = create_session()
+
+
 # ==== GOOGLE DRIVE HELPERS ==================================================
 
-def list_drive_items(folder_id: str, api_key: str, path: Optional[List[str]] = None) -> List[DriveItem]:
+def is_image_file(name: str, mime_type: str) -> bool:
+    # MIME first: Drive reports image/* for nearly every image, so the name
+    # check rarely runs. Only the last few characters are lower-cased for it.
+    if mime_type.lower().startswith(IMAGE_MIME_PREFIXES):
+        return True
+    return name[-IMAGE_SUFFIX_MAX_LEN:].lower().endswith(IMAGE_NAME_SUFFIXES)
+
+
+def list_drive_folder(
+    folder_id: str,
+    folder_path: List[str],
+    api_key: str,
+    page_size: int,
+) -> Tuple[List[DriveItem], List[Tuple[str, List[str]]]]:
     """
-    Recursively list every file in a Drive folder tree.
+    List a single Drive folder (all pages).
+
+    Returns the image files found directly inside it and the sub-folders that
+    still need to be visited.
     """
-    collected: List[DriveItem] = []
-    stack: List[Tuple[str, List[str]]] = [(folder_id, path or [])]
-    page_size = int(os.getenv("DRIVE_PAGE_SIZE", "200"))
-
-    while stack:
-        current_folder, current_path = stack.pop()
-        page_token = None
-
-        while True:
-            params = {
-                "q": f"'{current_folder}' in parents and trashed=false",
-                "fields": (
-                    "nextPageToken,"
-                    "files(id,name,mimeType,createdTime,modifiedTime,webViewLink,parents,size)"
-                ),
-                "key": api_key,
-                "pageSize": page_size,
-                "orderBy": "name",
-                "supportsAllDrives": "true",
-                "includeItemsFromAllDrives": "true",
-            }
-            if page_token:
-                params["pageToken"] = page_token
-
-            response = requests.get(DRIVE_API_URL, params=params, timeout=60)
-            if response.status_code != 200:
-                raise RuntimeError(f"Drive API error {response.status_code}: {response.text}")
-
-            payload = response.json()
-            files = payload.get("files", [])
-
-            for raw in files:
-                item = DriveItem(
+    images: List[DriveItem] = []
+    subfolders: List[Tuple[str, List[str]]] = []
+    joined_path = "/".join(folder_path)
+    page_token = None
+
+    while True:
+        params = {
+            **DRIVE_LIST_PARAMS,
+            "q": f"'{folder_id}' in parents and trashed=false",
+            "key": api_key,
+            "pageSize": page_size,
+        }
+        if page_token:
+            params["pageToken"] = page_token
+
+        response = SESSION.get(DRIVE_API_URL, params=params, timeout=60)
+        if response.status_code != 200:
+            raise RuntimeError(f"Drive API error {response.status_code}: {response.text}")
+
+        payload = json_loads(response.content)
+
+        # Filter on the raw payload so non-image files never become DriveItems.
+        for raw in payload.get("files", ()):
+            name = raw["name"]
+            mime_type = raw["mimeType"]
+            if mime_type == FOLDER_MIME_TYPE:
+                subfolders.append((raw["id"], folder_path + [name]))
+                continue
+            if not is_image_file(name, mime_type):
+                continue
+            images.append(
+                DriveItem(
                     id=raw["id"],
-                    name=raw["name"],
-                    mimeType=raw["mimeType"],
+                    name=name,
+                    mimeType=mime_type,
                     createdTime=raw.get("createdTime", ""),
                     modifiedTime=raw.get("modifiedTime", ""),
                     webViewLink=raw.get("webViewLink", ""),
-                    parents=raw.get("parents", []),
-                    size=raw.get("size"),
-                    path="/".join(current_path),
+                    path=joined_path,
+                    md5Checksum=raw.get("md5Checksum", ""),
+                    imageMediaMetadata=raw.get("imageMediaMetadata"),
                 )
-                if item.is_folder:
-                    stack.append((item.id, current_path + [item.name]))
-                else:
-                    extension_ok = item.extension in SUPPORTED_EXTENSIONS
-                    mime_ok = any(item.mimeType.lower().startswith(prefix) for prefix in IMAGE_MIME_PREFIXES)
-                    if extension_ok or mime_ok:
-                        collected.append(item)
+            )
 
-            page_token = payload.get("nextPageToken")
-            if not page_token:
-                break
+        page_token = payload.get("nextPageToken")
+        if not page_token:
+            break
+
+    return images, subfolders
 
-        # Be nice to the API if the tree is large.
-        time.sleep(0.1)
+
+def list_drive_items(folder_id: str, api_key: str, path: Optional[List[str]] = None) -> List[DriveItem]:
+    """
+    Recursively list every file in a Drive folder tree.
+
+    Folders are visited level by level; sibling folders are listed concurrently
+    (at most DRIVE_LIST_WORKERS requests in flight) so network latency overlaps.
+    Results keep a deterministic order regardless of completion order. Rate
+    limiting is handled by the session's 429 backoff rather than fixed sleeps.
+    """
+    collected: List[DriveItem] = []
+    frontier: List[Tuple[str, List[str]]] = [(folder_id, path or [])]
+    page_size = int(os.getenv("DRIVE_PAGE_SIZE", "1000"))
+
+    with ThreadPoolExecutor(max_workers=DRIVE_LIST_WORKERS) as pool:
+        while frontier:
+            results = pool.map(
+                lambda folder: list_drive_folder(folder[0], folder[1], api_key, page_size),
+                frontier,
+            )
+            next_frontier: List[Tuple[str, List[str]]] = []
+            for images, subfolders in results:
+                collected.extend(images)
+                next_frontier.extend(subfolders)
+            frontier = next_frontier
 
     logger.info("Discovered %s image assets", len(collected))
     return collected
@@ -246,64 +471,84 @@ def load_existing_manifest() -> Dict[str, dict]:
     if not OUTPUT_PATH.exists():
         return {}
     try:
-        data = json.loads(OUTPUT_PATH.read_text())
+        data = json_loads(OUTPUT_PATH.read_bytes())
         return {entry["id"]: entry for entry in data}
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses this
         logger.warning("Existing manifest is not valid JSON, ignoring cache.")
         return {}
 
 
 def load_tf_model() -> MobileNetV2:
-    if MobileNetV2 is None or tf is None:  # pragma: no cover - runtime guard
+    try:
+        from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2
+    except Exception as exc:  # pragma: no cover - runtime guard
         raise RuntimeError(
             "TensorFlow is not available. Install tensorflow-cpu to enable AI tagging."
-        )
+        ) from exc
     logger.info("Loading MobileNetV2 weights (Imagenet)…")
+    # No warm-up predict: the model is only built once an image actually needs
+    # fallback tagging, and that first real predict pays the one-time tracing cost.
     model = MobileNetV2(weights="imagenet")
-    # Warm-up call to avoid first-run latency.
-    dummy = np.zeros((1, 224, 224, 3), dtype=np.float32)
-    model.predict(dummy)
     logger.info("MobileNetV2 ready.")
     return model
 
 
-def download_image(url: str) -> Image.Image:
-    response = requests.get(url, timeout=60)
+def download_image(url: str) -> Tuple[Image.Image, Tuple[int, int]]:
+    """
+    Download a thumbnail and decode it to RGB; returns the image and its source
+    dimensions. JPEGs are decoded in draft mode, letting libjpeg scale by 1/2,
+    1/4 or 1/8 during the DCT as long as both sides stay >= MODEL_INPUT_SIZE,
+    since nothing downstream needs more detail than the model input. Only
+    thumbnails at least 448px on both sides shrink: a w512 portrait or square
+    thumbnail decodes at 1/4 of its pixels, while a 512x341 landscape one
+    decodes at full size (halving it would leave the model input 170px tall).
+    The whole body is buffered because draft() needs a seekable JPEG header.
+    """
+    response = SESSION.get(url, timeout=60)
     response.raise_for_status()
     try:
-        return Image.open(io.BytesIO(response.content)).convert("RGB")
-    except UnidentifiedImageError as exc:
+        img = Image.open(io.BytesIO(response.content))
+        source_size = img.size
+        img.draft("RGB", MODEL_INPUT_SIZE)
+        return img.convert("RGB"), source_size
+    except (OSError, SyntaxError) as exc:
         raise RuntimeError(f"Unable to decode image: {url}") from exc
 
 
-def resize_for_model(img: Image.Image) -> np.ndarray:
-    resized = img.copy().resize((224, 224))
-    arr = np.asarray(resized, dtype=np.float32)
-    arr = np.expand_dims(arr, axis=0)
-    return preprocess_input(arr)
+def resize_for_model(img: Image.Image) -> Image.Image:
+    return img.resize(MODEL_INPUT_SIZE, Image.Resampling.BILINEAR)
+
+
+def prepare_model_input(resized: Image.Image) -> np.ndarray:
+    # The float32 conversion is already a fresh buffer, so MobileNetV2's
+    # preprocessing (scale to [-1, 1]) is applied in place.
+    arr = np.asarray(resized, dtype=np.float32)[np.newaxis]
+    arr *= 1.0 / 127.5
+    arr -= 1.0
+    return arr
 
 
 def compute_average_rgb(img: Image.Image) -> Tuple[float, float, float]:
-    thumb = img.copy().resize((80, 80))
-    stat = ImageStat.Stat(thumb)
-    r, g, b = stat.mean[:3]
+    # A 1x1 BOX resize averages every source pixel in C, so no array round-trip.
+    r, g, b = img.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
     return float(r), float(g), float(b)
 
 
 def nearest_palette_color(rgb: Tuple[float, float, float]) -> str:
-    vector = np.array(rgb)
-    best_name = "Neutral"
-    best_distance = math.inf
-    for name, swatch in COLOR_PALETTE.items():
-        distance = np.linalg.norm(vector - swatch)
-        if distance < best_distance:
-            best_distance = distance
-            best_name = name
-    return best_name
+    # Squared distance has the same argmin as Euclidean distance, so skip the sqrt.
+    diff = PALETTE_ARRAY - np.asarray(rgb, dtype=np.float32)
+    return PALETTE_NAMES[int(np.einsum("ij,ij->i", diff, diff).argmin())]
 
 
 def format_tag(tag: str) -> str:
-    cleaned = re.sub(r"[\s_/,-]+", " ", str(tag)).strip()
+    # Stringify first: OpenAI payloads may contain unhashable values.
+    return _format_tag_text(str(tag))
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_tag_text(text: str) -> str:
+    # Tags repeat heavily across images (seasons, colours, folders), so memoise.
+    cleaned = TAG_SEPARATOR_RE.sub(" ", text).strip()
     return " ".join(word.capitalize() for word in cleaned.split() if word)
 
 
@@ -319,15 +564,26 @@ def deduplicate_tags(tags: Iterable[str]) -> List[str]:
     return ordered
 
 
-def wait_for_openai(interval: float) -> None:
-    """Respect configured rate limits between OpenAI calls."""
+def wait_for_openai() -> None:
+    """Respect OPENAI_REQUEST_INTERVAL and any rate-limit pause (shared across worker threads)."""
     global _last_openai_call
-    if interval <= 0:
-        return
-    elapsed = time.perf_counter() - _last_openai_call
-    if elapsed < interval:
-        time.sleep(interval - elapsed)
-    _last_openai_call = time.perf_counter()
+    while True:
+        with _openai_lock:
+            now = time.perf_counter()
+            delay = max(OPENAI_REQUEST_INTERVAL - (now - _last_openai_call), _openai_paused_until - now)
+            if delay <= 0:
+                _last_openai_call = now
+                return
+        # Sleep without the lock so a pause ends for every worker at once, then
+        # re-check in case the slot was taken or a new pause was recorded.
+        time.sleep(delay)
+
+
+def back_off_openai(wait_seconds: float) -> None:
+    """Pause every worker's next OpenAI call for `wait_seconds`."""
+    global _openai_paused_until
+    with _openai_lock:
+        _openai_paused_until = max(_openai_paused_until, time.perf_counter() + wait_seconds)
 
 
 def init_openai_client() -> Optional["OpenAI"]:
@@ -368,13 +624,12 @@ def generate_openai_metadata(client: Optional["OpenAI"], item: DriveItem, image_
         """
     ).strip()
 
-    interval = OPENAI_REQUEST_INTERVAL
     data: Optional[dict] = None
     last_error = None
     attempt = 1
     while attempt <= OPENAI_MAX_RETRIES:
         try:
-            wait_for_openai(interval)
+            wait_for_openai()
             response = client.responses.create(
                 model="gpt-4o-mini",
                 temperature=0.2,
@@ -406,7 +661,7 @@ def generate_openai_metadata(client: Optional["OpenAI"], item: DriveItem, image_
             try:
                 data = json.loads(result_text)
             except json.JSONDecodeError:
-                json_candidates = re.findall(r"\{.*\}", result_text, flags=re.DOTALL)
+                json_candidates = JSON_OBJECT_RE.findall(result_text)
                 data = None
                 for candidate in json_candidates:
                     try:
@@ -424,16 +679,17 @@ def generate_openai_metadata(client: Optional["OpenAI"], item: DriveItem, image_
             message = str(exc)
             if "rate_limit" in message or "Limit" in message:
                 wait_seconds = OPENAI_BACKOFF_SECONDS
-                match = re.search(r"try again in ([0-9.]+)s", message)
+                match = RETRY_AFTER_RE.search(message)
                 if match:
                     wait_seconds = max(wait_seconds, float(match.group(1)))
-                interval = max(interval, wait_seconds)
                 logger.warning("[OpenAI] %s (attempt %s/%s) rate limit: %s (sleeping %.2fs)", item.name, attempt, OPENAI_MAX_RETRIES, message, wait_seconds)
-                time.sleep(wait_seconds)
+                # The next wait_for_openai() sleeps this off, in this and every other worker.
+                back_off_openai(wait_seconds)
                 attempt += 1
                 continue
             if "TPM" in message or "tokens per min" in message:
                 logger.warning("[OpenAI] %s: token cap reached, deferring to fallback. (%s)", item.name, message)
+                back_off_openai(OPENAI_BACKOFF_SECONDS)
                 return None
             logger.warning("[OpenAI] %s (attempt %s/%s): %s", item.name, attempt, OPENAI_MAX_RETRIES, message)
             time.sleep(OPENAI_BACKOFF_SECONDS)
@@ -520,31 +776,64 @@ def compute_difficulty_score(tags: List[str], predictions: List[Tuple[str, float
 
 EXIF_KEY_MAP = {v: k for k, v in EXIF_TAGS.items()}
 
+# Numeric tag ids resolved once at import instead of per lookup.
+EXIF_MODEL_TAG = EXIF_KEY_MAP.get("Model")
+EXIF_LENS_MODEL_TAG = EXIF_KEY_MAP.get("LensModel")
+EXIF_DATETIME_TAGS = tuple(
+    EXIF_KEY_MAP[field]
+    for field in ("DateTimeOriginal", "DateTimeDigitized", "DateTime")
+    if field in EXIF_KEY_MAP
+)
 
-def extract_exif_field(exif: dict, field: str) -> Optional[str]:
-    key = EXIF_KEY_MAP.get(field)
-    if key is None:
-        return None
-    value = exif.get(key)
+
+def read_exif(img: Image.Image) -> dict:
+    """
+    Parse EXIF once into a plain dict. LensModel and DateTimeOriginal live in
+    the Exif sub-IFD rather than IFD0, so that directory is merged in too.
+    """
+    exif = img.getexif()
+    if not exif:
+        return {}
+    tags = dict(exif)
+    tags.update(exif.get_ifd(EXIF_IFD.Exif))
+    return tags
+
+
+def exif_text(value) -> Optional[str]:
     if value is None:
         return None
     if isinstance(value, bytes):
-        try:
-            return value.decode("utf-8", errors="ignore")
-        except Exception:
-            return None
+        return value.decode("utf-8", errors="ignore")
     return str(value)
 
 
+def extract_exif_field(exif: dict, tag: Optional[int]) -> Optional[str]:
+    if tag is None:
+        return None
+    return exif_text(exif.get(tag))
+
+
 def derive_datetime(exif: dict, fallback: str) -> str:
-    for field in ("DateTimeOriginal", "DateTimeDigitized", "DateTime"):
-        value = extract_exif_field(exif, field)
+    for tag in EXIF_DATETIME_TAGS:
+        value = exif_text(exif.get(tag))
         if value:
             return value
     return fallback
 
 
+@functools.lru_cache(maxsize=4096)
 def derive_season_and_year(date_str: str) -> Tuple[str, int]:
+    # Drive ("2025-02-09T21:05:15.313Z") and EXIF ("2021:07:04 12:34:56") timestamps
+    # share a fixed YYYY?MM layout, so slice year/month before falling back to a full parse.
+    if len(date_str) >= 7 and date_str[4] in "-:":
+        try:
+            year, month = int(date_str[0:4]), int(date_str[5:7])
+        except ValueError:
+            pass
+        else:
+            if 1 <= month <= 12:
+                return MONTH_TO_SEASON[month], year
+
     try:
         date_obj = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
     except ValueError:
@@ -552,78 +841,114 @@ def derive_season_and_year(date_str: str) -> Tuple[str, int]:
         try:
             date_obj = datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
         except Exception:
-            date_obj = datetime.utcnow()
-
-    month = date_obj.month
-    if 3 <= month <= 5:
-        season = "Spring"
-    elif 6 <= month <= 8:
-        season = "Summer"
-    elif 9 <= month <= 11:
-        season = "Fall"
-    else:
-        season = "Winter"
-    return season, date_obj.year
+            date_obj = RUN_STARTED_AT
+
+    return MONTH_TO_SEASON[date_obj.month], date_obj.year
 
 
 # ==== PIPELINE ==============================================================
 
-def build_manifest_entry(
+def analyse_item(
     item: DriveItem,
-    model_provider: Optional[Callable[[], Optional[MobileNetV2]]],
     skip_ai: bool,
     openai_client: Optional["OpenAI"],
-) -> ManifestEntry:
+    fallback_enabled: bool,
+) -> ImageAnalysis:
     logger.info("Processing %s", item.name)
-    img = download_image(item.image_url)
-    width, height = img.size
-    orientation = "Portrait" if height >= width else "Landscape"
 
     tags: List[str] = []
-    difficulty = 3
-    predictions: List[Tuple[str, float]] = []
-
-    avg_rgb = compute_average_rgb(img)
-    color = nearest_palette_color(avg_rgb)
+    difficulty = DEFAULT_DIFFICULTY
+    color: Optional[str] = None
     description = ""
 
     if not skip_ai and openai_client:
         metadata = generate_openai_metadata(
             openai_client,
             item,
-            f"https://lh3.googleusercontent.com/d/{item.id}=w1200",
+            item.display_url,
         )
         if metadata:
             tags = metadata.get("tags", [])
             difficulty = metadata.get("difficulty", difficulty)
             description = metadata.get("description", "")
-            color = metadata.get("primary_color") or color
-
-    if not tags and not skip_ai and model_provider:
-        fallback_model = model_provider()
-        if fallback_model:
-            prepared = resize_for_model(img)
-            raw_preds = fallback_model.predict(prepared)
-            decoded = decode_predictions(raw_preds, top=5)[0]
-            predictions = [(label.replace("_", " ").title(), float(score)) for _, label, score in decoded]
-            tags = [label for label, score in predictions if score >= 0.2][:5]
-            if len(tags) < 3:
-                tags.extend([label for label, _ in predictions if label not in tags])
-            tags = tags[:5]
-            difficulty = compute_difficulty_score(tags, predictions)
+            color = metadata.get("primary_color")
+
+    # OpenAI fetches the image itself and Drive already reports dimensions and
+    # camera metadata, so only download the thumbnail for whatever is missing.
+    needs_fallback_tags = not tags and not skip_ai and fallback_enabled
+    dimensions = item.media_dimensions
+    if skip_ai:
+        # Smoke-test runs build entries from Drive's metadata alone and never download.
+        dimensions = dimensions or (0, 0)
+        color = DEFAULT_COLOR
+    img: Optional[Image.Image] = None
+    model_img: Optional[Image.Image] = None
+    if dimensions is None or color is None or needs_fallback_tags:
+        img, source_size = download_image(item.image_url)
+        if dimensions is None:
+            dimensions = source_size
+        # Resize once: the model input also serves as the colour sample.
+        if needs_fallback_tags:
+            model_img = resize_for_model(img)
+        if color is None:
+            color = nearest_palette_color(compute_average_rgb(model_img or img))
+
+    media = item.imageMediaMetadata or {}
+    exif_data = read_exif(img) if img is not None and item.may_have_exif else {}
+    width, height = dimensions
+    return ImageAnalysis(
+        item=item,
+        tags=tags,
+        difficulty=difficulty,
+        color=color,
+        description=description,
+        width=width,
+        height=height,
+        camera=media.get("cameraModel") or extract_exif_field(exif_data, EXIF_MODEL_TAG) or UNKNOWN_EQUIPMENT,
+        lens=media.get("lens") or extract_exif_field(exif_data, EXIF_LENS_MODEL_TAG) or UNKNOWN_EQUIPMENT,
+        dateTime=media.get("time") or derive_datetime(exif_data, item.createdTime),
+        # Only the 224x224 tensor is kept, so the decoded image can be freed now.
+        model_input=prepare_model_input(model_img) if model_img is not None else None,
+    )
 
-    tags = deduplicate_tags(tags)
 
-    exif_data = img.getexif() or {}
-    camera = extract_exif_field(exif_data, "Model") or "Unknown"
-    lens = extract_exif_field(exif_data, "LensModel") or "Unknown"
-    date_time_str = derive_datetime(exif_data, item.createdTime)
-    season, year = derive_season_and_year(date_time_str or item.createdTime)
+def predict_fallback_labels(
+    model: MobileNetV2,
+    model_inputs: Sequence[np.ndarray],
+) -> List[List[Tuple[str, float]]]:
+    """Run one predict() over a batch of prepared images; top-5 labels per image."""
+    # Already imported by load_tf_model, so this is just a sys.modules lookup.
+    from tensorflow.keras.applications.mobilenet_v2 import decode_predictions
+
+    raw_preds = model.predict(np.concatenate(model_inputs))
+    return [
+        [(label.replace("_", " ").title(), float(score)) for _, label, score in decoded]
+        for decoded in decode_predictions(raw_preds, top=5)
+    ]
+
+
+def apply_fallback_predictions(analysis: ImageAnalysis, predictions: List[Tuple[str, float]]) -> None:
+    tags = [label for label, score in predictions if score >= 0.2][:5]
+    if len(tags) < 3:
+        tags.extend([label for label, _ in predictions if label not in tags])
+    analysis.tags = tags[:5]
+    analysis.difficulty = compute_difficulty_score(analysis.tags, predictions)
+    analysis.model_input = None
+
 
+def finalize_entry(analysis: ImageAnalysis, ai_version: str = AI_VERSION) -> ManifestEntry:
+    item = analysis.item
+    width, height = analysis.width, analysis.height
+    # Unknown (0x0) dimensions fall back to the default, as in placeholder_entry.
+    orientation = "Portrait" if height >= width > 0 else DEFAULT_ORIENTATION
+    camera, lens = analysis.camera, analysis.lens
+    season, year = derive_season_and_year(analysis.dateTime or item.createdTime)
+
+    tags = deduplicate_tags(analysis.tags)
     extras = [
         season,
         orientation,
-        color,
+        analysis.color,
         item.path.split("/")[-1] if item.path else "",
     ]
     for extra in extras:
@@ -643,7 +968,7 @@ def build_manifest_entry(
         id=item.id,
         name=item.display_name,
         path=item.path,
-        src=f"https://lh3.googleusercontent.com/d/{item.id}=w1200",
+        src=item.display_url,
         view=item.webViewLink,
         createdTime=item.createdTime,
         modifiedTime=item.modifiedTime,
@@ -651,18 +976,207 @@ def build_manifest_entry(
         season=season,
         year=year,
         tags=tags[:5],
-        difficulty=int(difficulty),
-        color=color,
+        difficulty=int(analysis.difficulty),
+        color=analysis.color,
         orientation=orientation,
         width=width,
         height=height,
         camera=camera,
         lens=lens,
-        dateTime=date_time_str,
-        description=description,
+        dateTime=analysis.dateTime,
+        description=analysis.description,
+        aiVersion=ai_version,
+        md5Checksum=item.md5Checksum,
+    )
+
+
+def failure_entry(item: DriveItem, cached: Optional[dict], exc: Exception) -> ManifestEntry:
+    """Fall back to cached or minimal metadata for an item whose analysis failed."""
+    logger.error("Failed to process %s: %s", item.name, exc)
+    if cached:
+        logger.info("Using cached metadata for %s despite error.", item.name)
+        return ManifestEntry(**cached)
+    # Pending, so the next run retries it and checksum matches never reuse it.
+    return placeholder_entry(item, ai_version=PENDING_AI_VERSION)
+
+
+def placeholder_entry(
+    item: DriveItem,
+    cached: Optional[dict] = None,
+    ai_version: str = AI_VERSION,
+) -> ManifestEntry:
+    """
+    Entry for an image without fresh analysis, so it stays surfaced. Visual
+    metadata is carried over from `cached` when available; tags and the
+    description are left empty until the image is analysed.
+    """
+    cached = cached or {}
+    if cached.get("season") and cached.get("year"):
+        season, year = cached["season"], int(cached["year"])
+    else:
+        season, year = derive_season_and_year(item.createdTime)
+    return ManifestEntry(
+        id=item.id,
+        name=item.display_name,
+        path=item.path,
+        src=item.display_url,
+        view=item.webViewLink,
+        createdTime=item.createdTime,
+        modifiedTime=item.modifiedTime,
+        mimeType=item.mimeType,
+        season=season,
+        year=year,
+        tags=EMPTY_TAGS,
+        difficulty=DEFAULT_DIFFICULTY,
+        color=cached.get("color", DEFAULT_COLOR),
+        orientation=cached.get("orientation", DEFAULT_ORIENTATION),
+        width=int(cached.get("width", 0)),
+        height=int(cached.get("height", 0)),
+        camera=cached.get("camera", UNKNOWN_EQUIPMENT),
+        lens=cached.get("lens", UNKNOWN_EQUIPMENT),
+        dateTime=cached.get("dateTime"),
+        description="",
+        aiVersion=ai_version,
+        md5Checksum=item.md5Checksum,
+    )
+
+
+def process_item(
+    item: DriveItem,
+    cached: Optional[dict],
+    skip_ai: bool,
+    openai_client: Optional["OpenAI"],
+    fallback_enabled: bool,
+) -> Union[ManifestEntry, ImageAnalysis]:
+    """
+    Analyse one stale item. Returns the finished entry, or the analysis itself
+    when it is still waiting for batched MobileNetV2 tagging.
+    """
+    try:
+        analysis = analyse_item(item, skip_ai, openai_client, fallback_enabled)
+        if analysis.model_input is not None:
+            return analysis
+        # SKIP_AI entries hold Drive metadata only; stamp them so the next real
+        # run analyses them instead of treating them as cached.
+        return finalize_entry(analysis, ai_version=PENDING_AI_VERSION if skip_ai else AI_VERSION)
+    except Exception as exc:
+        return failure_entry(item, cached, exc)
+
+
+def run_fallback_batch(
+    batch: List[ImageAnalysis],
+    model_provider: Callable[[], MobileNetV2],
+    existing: Dict[str, dict],
+) -> List[ManifestEntry]:
+    """Tag a batch of images with a single MobileNetV2 predict() and finish their entries."""
+    try:
+        predictions = predict_fallback_labels(model_provider(), [analysis.model_input for analysis in batch])
+    except Exception as exc:
+        return [failure_entry(analysis.item, existing.get(analysis.item.id), exc) for analysis in batch]
+    entries = []
+    for analysis, item_predictions in zip(batch, predictions):
+        apply_fallback_predictions(analysis, item_predictions)
+        entries.append(finalize_entry(analysis))
+    return entries
+
+
+def write_checkpoint(
+    entries: List[ManifestEntry],
+    pending_ids: set[str],
+    existing: Dict[str, dict],
+) -> None:
+    """
+    Persist progress mid-run. Items still in flight keep their previous cached
+    entry (if any), so a restart re-analyses only what hasn't finished yet.
+    """
+    snapshot = list(entries)
+    snapshot.extend(ManifestEntry(**existing[item_id]) for item_id in pending_ids if item_id in existing)
+    write_manifest(snapshot)
+    logger.info("Checkpoint saved (%s entries, %s still pending).", len(snapshot), len(pending_ids))
+
+
+def needs_refresh(item: DriveItem, cached: Optional[dict]) -> bool:
+    if cached is None or cached.get("aiVersion") != AI_VERSION:
+        return True
+    if cached.get("modifiedTime") == item.modifiedTime:
+        return False
+    # Touched in Drive (rename, description edit, ...) but the bytes are identical:
+    # the cached analysis is still valid, so skip the download and OpenAI call.
+    return not (item.md5Checksum and cached.get("md5Checksum") == item.md5Checksum)
+
+
+def drive_fields_match(item: DriveItem, cached: dict) -> bool:
+    """True when the cached entry already reflects the item's current Drive metadata."""
+    return (
+        cached.get("modifiedTime") == item.modifiedTime
+        and cached.get("name") == item.display_name
+        and cached.get("path") == item.path
+        and cached.get("view") == item.webViewLink
+        and cached.get("createdTime") == item.createdTime
+        and cached.get("mimeType") == item.mimeType
+    )
+
+
+def reuse_cached_entry(item: DriveItem, cached: dict) -> ManifestEntry:
+    """Reuse a cached analysis, taking every Drive-derived field from the current item."""
+    if drive_fields_match(item, cached):
+        entry = ManifestEntry(**cached)
+        entry.md5Checksum = item.md5Checksum
+        return entry
+    # Renamed or otherwise touched with identical bytes: keep the analysis but
+    # rebuild name, path, link and folder tag from Drive.
+    return finalize_entry(analysis_from_cache(item, cached))
+
+
+def index_by_checksum(existing: Dict[str, dict]) -> Dict[str, dict]:
+    """Current-version cached entries keyed by md5Checksum."""
+    return {
+        entry["md5Checksum"]: entry
+        for entry in existing.values()
+        if entry.get("md5Checksum") and entry.get("aiVersion") == AI_VERSION
+    }
+
+
+def analysis_from_cache(item: DriveItem, cached: dict) -> ImageAnalysis:
+    """
+    Rebuild an analysis from an entry with identical content (the same file
+    renamed or moved, or a copy). Its old folder tag is dropped so
+    finalize_entry can add the new one; everything else depends only on the
+    pixels and EXIF.
+    """
+    # Tags went through format_tag, so compare against the formatted folder name.
+    old_folder = format_tag((cached.get("path") or "").split("/")[-1]).lower()
+    return ImageAnalysis(
+        item=item,
+        tags=[tag for tag in cached.get("tags", []) if tag.lower() != old_folder],
+        difficulty=int(cached.get("difficulty", DEFAULT_DIFFICULTY)),
+        color=cached.get("color", DEFAULT_COLOR),
+        description=cached.get("description", ""),
+        width=int(cached.get("width", 0)),
+        height=int(cached.get("height", 0)),
+        camera=cached.get("camera", UNKNOWN_EQUIPMENT),
+        lens=cached.get("lens", UNKNOWN_EQUIPMENT),
+        dateTime=cached.get("dateTime"),
     )
 
 
+def manifest_is_current(items: List[DriveItem], existing: Dict[str, dict]) -> bool:
+    """True when the manifest already holds an up-to-date entry for exactly these items."""
+    if len(items) != len(existing):
+        return False
+    for item in items:
+        cached = existing.get(item.id)
+        if (
+            cached is None
+            or cached.get("aiVersion") != AI_VERSION
+            or cached.get("md5Checksum", "") != item.md5Checksum
+            # Folder moves and renames don't always bump modifiedTime.
+            or not drive_fields_match(item, cached)
+        ):
+            return False
+    return True
+
+
 def build_manifest(
     items: Iterable[DriveItem],
     existing: Dict[str, dict],
@@ -671,20 +1185,26 @@ def build_manifest(
     items = list(items)
     logger.info("Preparing manifest entries (AI %s)", "disabled" if skip_ai else "enabled")
 
+    # Decide if we need TensorFlow (fallback only). Staleness is evaluated once
+    # per item here and reused by the main loop below.
+    process_needed = [item for item in items if needs_refresh(item, existing.get(item.id))]
+    by_checksum = index_by_checksum(existing)
+    content_matches = {
+        item.id: by_checksum[item.md5Checksum] for item in process_needed if item.md5Checksum in by_checksum
+    }
+    if content_matches:
+        logger.info("%s moved or copied assets reuse the analysis of identical content", len(content_matches))
+        process_needed = [item for item in process_needed if item.id not in content_matches]
+    stale_ids = {item.id for item in process_needed}
+    logger.info("%s of %s assets require fresh analysis", len(process_needed), len(items))
+    if not process_needed and not content_matches:
+        # Everything is cached: no OpenAI client, no TensorFlow, no downloads.
+        return [reuse_cached_entry(item, existing[item.id]) for item in items]
+
     openai_client = init_openai_client() if not skip_ai else None
     if openai_client:
         logger.info("OpenAI tagging enabled via OPENAI_API_KEY.")
 
-    # Decide if we need TensorFlow (fallback only)
-    process_needed = [
-        item
-        for item in items
-        if item.id not in existing
-        or existing[item.id].get("modifiedTime") != item.modifiedTime
-        or existing[item.id].get("aiVersion") != AI_VERSION
-    ]
-    logger.info("%s of %s assets require fresh analysis", len(process_needed), len(items))
-
     max_items = 0
     try:
         max_items = int(os.getenv("MAX_ITEMS_PER_RUN", "0"))
@@ -705,10 +1225,12 @@ def build_manifest(
     elif process_needed:
         process_ids = {item.id for item in process_needed}
 
+    # The fallback model is only loaded (and only ever called) from this thread,
+    # when the first batch of images without OpenAI tags is ready.
     model: Optional[MobileNetV2] = None
-    model_provider: Optional[Callable[[], Optional[MobileNetV2]]] = None
+    model_provider: Optional[Callable[[], MobileNetV2]] = None
     if not skip_ai and process_needed:
-        def get_tf_model() -> Optional[MobileNetV2]:
+        def get_tf_model() -> MobileNetV2:
             nonlocal model
             if model is None:
                 model = load_tf_model()
@@ -717,94 +1239,126 @@ def build_manifest(
         model_provider = get_tf_model
 
     manifest_entries: List[ManifestEntry] = []
+    to_process: List[DriveItem] = []
     for item in items:
         cached = existing.get(item.id)
-        needs_rebuild = (
-            cached is None
-            or cached.get("modifiedTime") != item.modifiedTime
-            or cached.get("aiVersion") != AI_VERSION
-        )
+        needs_rebuild = item.id in stale_ids
         if needs_rebuild and process_ids is not None and item.id not in process_ids:
             logger.info("Deferring %s (ID %s) to a later run.", item.name, item.id)
-            cached_entry = cached if cached else {}
-            if cached_entry.get("season") and cached_entry.get("year"):
-                season = cached_entry.get("season")
-                year = int(cached_entry.get("year"))
-            else:
-                season, year = derive_season_and_year(item.createdTime or datetime.utcnow().isoformat())
-            manifest_entries.append(
-                ManifestEntry(
-                    id=item.id,
-                    name=item.display_name,
-                    path=item.path,
-                    src=f"https://lh3.googleusercontent.com/d/{item.id}=w1200",
-                    view=item.webViewLink,
-                    createdTime=item.createdTime,
-                    modifiedTime=item.modifiedTime,
-                    mimeType=item.mimeType,
-                    season=season,
-                    year=year,
-                    tags=[],
-                    difficulty=3,
-                    color=cached_entry.get("color", "Neutral"),
-                    orientation=cached_entry.get("orientation", "Landscape"),
-                    width=int(cached_entry.get("width", 0)),
-                    height=int(cached_entry.get("height", 0)),
-                    camera=cached_entry.get("camera", "Unknown"),
-                    lens=cached_entry.get("lens", "Unknown"),
-                    dateTime=cached_entry.get("dateTime"),
-                    description="",
-                    aiVersion="PENDING",
-                )
-            )
+            manifest_entries.append(placeholder_entry(item, cached, ai_version=PENDING_AI_VERSION))
+            continue
+
+        if item.id in content_matches:
+            manifest_entries.append(finalize_entry(analysis_from_cache(item, content_matches[item.id])))
             continue
 
         if not needs_rebuild:
-            manifest_entries.append(ManifestEntry(**cached))
+            manifest_entries.append(reuse_cached_entry(item, cached))
             continue
 
-        try:
-            entry = build_manifest_entry(item, model_provider, skip_ai, openai_client)
-            manifest_entries.append(entry)
-        except Exception as exc:
-            logger.error("Failed to process %s: %s", item.name, exc)
-            if cached:
-                logger.info("Using cached metadata for %s despite error.", item.name)
-                manifest_entries.append(ManifestEntry(**cached))
-            else:
-                # Minimal entry to keep the image surfaced.
-                season, year = derive_season_and_year(item.createdTime or datetime.utcnow().isoformat())
-                manifest_entries.append(
-                    ManifestEntry(
-                        id=item.id,
-                        name=item.display_name,
-                        path=item.path,
-                        src=f"https://lh3.googleusercontent.com/d/{item.id}=w1200",
-                        view=item.webViewLink,
-                        createdTime=item.createdTime,
-                        modifiedTime=item.modifiedTime,
-                        mimeType=item.mimeType,
-                        season=season,
-                        year=year,
-                        tags=[],
-                        difficulty=3,
-                        color="Neutral",
-                        orientation="Landscape",
-                        width=0,
-                        height=0,
-                        camera="Unknown",
-                        lens="Unknown",
-                        dateTime=None,
-                        description="",
-                    )
-                )
+        to_process.append(item)
+
+    if to_process:
+        logger.info("Analysing %s assets with up to %s workers", len(to_process), MAX_WORKERS)
+        pending_ids = {item.id for item in to_process}
+        fallback_enabled = model_provider is not None
+        # Workers download and prepare images; images that still need MobileNetV2
+        # tags are queued here and run through the model FALLBACK_BATCH_SIZE at a
+        # time, which is far cheaper than one predict() per image.
+        fallback_batch: List[ImageAnalysis] = []
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [
+                pool.submit(process_item, item, existing.get(item.id), skip_ai, openai_client, fallback_enabled)
+                for item in to_process
+            ]
+            # Entries finished since the last checkpoint. Counting entries rather
+            # than completed futures avoids rewriting an unchanged manifest while
+            # results sit in fallback_batch.
+            unsaved = 0
+            for future in as_completed(futures):
+                result = future.result()
+                finished: List[ManifestEntry] = []
+                if isinstance(result, ImageAnalysis):
+                    fallback_batch.append(result)
+                    if len(fallback_batch) >= FALLBACK_BATCH_SIZE:
+                        finished = run_fallback_batch(fallback_batch, model_provider, existing)
+                        fallback_batch = []
+                else:
+                    finished = [result]
+                manifest_entries.extend(finished)
+                pending_ids.difference_update(entry.id for entry in finished)
+                unsaved += len(finished)
+                if CHECKPOINT_EVERY > 0 and unsaved >= CHECKPOINT_EVERY and pending_ids:
+                    write_checkpoint(manifest_entries, pending_ids, existing)
+                    unsaved = 0
+        if fallback_batch:
+            manifest_entries.extend(run_fallback_batch(fallback_batch, model_provider, existing))
 
-    manifest_entries.sort(key=lambda e: (e.year * -1, e.createdTime, e.name))
     return manifest_entries
 
 
 # ==== MAIN ==================================================================
 
+def write_atomic(path: Path, payload: bytes) -> None:
+    """
+    Write via a sibling temp file and os.replace so a crash mid-write never
+    leaves a truncated manifest (which would discard the whole cache).
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def write_manifest(entries: List[ManifestEntry]) -> bytes:
+    """Sort `entries` in place and atomically write the manifest; returns the payload."""
+    entries.sort(key=manifest_sort_key)
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    payload = json_dumps(entries, pretty=os.getenv("MANIFEST_PRETTY") == "1")
+    write_atomic(OUTPUT_PATH, payload)
+    return payload
+
+
+def write_compressed_copies(path: Path, payload: bytes) -> None:
+    """
+    Write .gz (and .br when brotli is installed) siblings of the manifest for
+    hosts that serve pre-compressed assets. gzip's mtime is pinned so
+    unchanged manifests produce byte-identical archives.
+    """
+    gz_path = path.with_name(path.name + ".gz")
+    write_atomic(gz_path, gzip.compress(payload, compresslevel=9, mtime=0))
+    logger.info("Compressed copy written to %s", gz_path)
+
+    if brotli is None:
+        logger.info("brotli package not installed; skipping .br copy.")
+        return
+    br_path = path.with_name(path.name + ".br")
+    write_atomic(br_path, brotli.compress(payload, quality=11))
+    logger.info("Compressed copy written to %s", br_path)
+
+
+def write_ndjson(path: Path, entries: Iterable[ManifestEntry]) -> None:
+    """
+    Write one compact JSON object per line so clients can render entries as
+    they stream in, and git diffs stay line-oriented.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        fh.writelines(json_dumps(entry) + b"\n" for entry in entries)
+    os.replace(tmp_path, path)
+    logger.info("NDJSON copy written to %s", path)
+
+
+def manifest_sort_key(entry: ManifestEntry) -> Tuple[str, str, int, str, str]:
+    """Order by path and name; newest year first breaks ties."""
+    return (
+        (entry.path or "").lower(),
+        (entry.name or "").lower(),
+        -entry.year,
+        entry.createdTime,
+        entry.name,
+    )
+
+
 def main() -> None:
     api_key = os.getenv("GOOGLE_API_KEY")
     folder_id = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
@@ -819,23 +1373,19 @@ def main() -> None:
     items = list_drive_items(folder_id, api_key)
 
     existing = load_existing_manifest()
-    manifest_entries = build_manifest(items, existing, skip_ai=skip_ai)
+    if os.getenv("FORCE_REBUILD") != "1" and manifest_is_current(items, existing):
+        logger.info("Drive contents match the existing manifest; nothing to rebuild.")
+        return
 
-    manifest_records = [asdict(entry) for entry in manifest_entries]
-    manifest_records.sort(
-        key=lambda r: (
-            (r.get("path") or "").lower(),
-            (r.get("name") or "").lower(),
-        )
-    )
+    manifest_entries = build_manifest(items, existing, skip_ai=skip_ai)
 
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_PATH.open("w", encoding="utf-8") as fh:
-        json.dump(manifest_records, fh, indent=2)
+    payload = write_manifest(manifest_entries)
+    if os.getenv("MANIFEST_COMPRESS") == "1":
+        write_compressed_copies(OUTPUT_PATH, payload)
+    if os.getenv("MANIFEST_NDJSON") == "1":
+        write_ndjson(OUTPUT_PATH.with_suffix(".ndjson"), manifest_entries)
 
-    logger.info("Manifest written to %s", OUTPUT_PATH)
-    logger.info("Total entries: %s", len(manifest_entries))
-    logger.info("Done.")
+    logger.info("Manifest written to %s (%s entries). Done.", OUTPUT_PATH, len(manifest_entries))
 
 
 if __name__ == "__main__":